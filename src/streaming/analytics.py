@@ -0,0 +1,398 @@
+"""Rolling per-instrument analytics computed from decoded ticks.
+
+:class:`AnalyticsStage` is a ``StreamConfig.on_ticks`` handler that maintains
+rolling VWAP, log returns/volatility and a per-price volume profile for each
+instrument. Every metric is updated in O(1) per tick using fixed-size ring
+buffers, and only the metrics that at least one subscriber asked for are
+computed. :meth:`AnalyticsStage.process_batch` offers a vectorised NumPy path
+for replaying history or catching up after a gap.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from .config import Tick
+
+MetricHandler = Callable[[str, Dict[str, Any]], None]
+
+
+class _Ring:
+    """Fixed-size float ring buffer that keeps a running sum of its contents."""
+
+    __slots__ = ("values", "size", "count", "index", "total")
+
+    def __init__(self, size: int) -> None:
+        self.values = [0.0] * size
+        self.size = size
+        self.count = 0
+        self.index = 0
+        self.total = 0.0
+
+    def push(self, value: float) -> float:
+        """Append ``value`` and return the value it evicted (``0.0`` while filling)."""
+
+        evicted = self.values[self.index]
+        self.values[self.index] = value
+        self.index += 1
+        if self.index == self.size:
+            self.index = 0
+            # Resum once per revolution so floating point drift cannot accumulate.
+            self.total = math.fsum(self.values)
+        else:
+            self.total += value - evicted
+        if self.count < self.size:
+            self.count += 1
+        return evicted
+
+
+class RollingVWAP:
+    """Volume weighted average price over the last ``window`` trades."""
+
+    metrics = ("vwap",)
+
+    def __init__(self, window: int, tick_size: float) -> None:
+        self._notional = _Ring(window)
+        self._volume = _Ring(window)
+
+    def update(self, price: float, quantity: Optional[float]) -> None:
+        if not quantity:
+            return
+        self._notional.push(price * quantity)
+        self._volume.push(quantity)
+
+    def values(self) -> Dict[str, Any]:
+        volume = self._volume.total
+        return {"vwap": self._notional.total / volume if volume else None}
+
+
+class RollingReturns:
+    """Log returns and their rolling sample volatility over ``window`` returns.
+
+    A return is sampled on every trade and on every price change. Quote and depth
+    updates that repeat the last price are not observations, and counting them
+    as zero returns would drag the volatility towards zero in quiet markets.
+    """
+
+    metrics = ("returns", "volatility")
+
+    def __init__(self, window: int, tick_size: float) -> None:
+        self._returns = _Ring(window)
+        self._squares = _Ring(window)
+        self._last_price: Optional[float] = None
+        self._last_return: Optional[float] = None
+
+    def update(self, price: float, quantity: Optional[float]) -> None:
+        last_price = self._last_price
+        if not quantity and price == last_price:
+            return
+        self._last_price = price
+        if last_price is None or last_price <= 0 or price <= 0:
+            return
+        log_return = math.log(price / last_price)
+        self._last_return = log_return
+        self._returns.push(log_return)
+        self._squares.push(log_return * log_return)
+
+    def values(self) -> Dict[str, Any]:
+        count = self._returns.count
+        total = self._returns.total
+        volatility = None
+        if count > 1:
+            variance = (self._squares.total - total * total / count) / (count - 1)
+            volatility = math.sqrt(max(variance, 0.0))
+        return {
+            "returns": {"last": self._last_return, "window": total if count else None},
+            "volatility": volatility,
+        }
+
+
+class VolumeProfile:
+    """Traded volume per price level over the last ``window`` trades."""
+
+    metrics = ("volume_profile",)
+
+    def __init__(self, window: int, tick_size: float) -> None:
+        self._tick_size = tick_size
+        self._levels = [0] * window
+        self._volumes = [0.0] * window
+        self._index = 0
+        self._profile: Dict[float, float] = {}
+        self._view = MappingProxyType(self._profile)
+
+    def update(self, price: float, quantity: Optional[float]) -> None:
+        if not quantity:
+            return
+        index = self._index
+        old_volume = self._volumes[index]
+        if old_volume:
+            old_price = self._levels[index] * self._tick_size
+            remaining = self._profile[old_price] - old_volume
+            if remaining > 0:
+                self._profile[old_price] = remaining
+            else:
+                del self._profile[old_price]
+        level = round(price / self._tick_size)
+        level_price = level * self._tick_size
+        self._profile[level_price] = self._profile.get(level_price, 0.0) + quantity
+        self._levels[index] = level
+        self._volumes[index] = quantity
+        self._index = (index + 1) % len(self._volumes)
+
+    def values(self) -> Dict[str, Any]:
+        # A live read-only view keeps reads O(1); copy it if you need a snapshot.
+        return {"volume_profile": self._view}
+
+
+METRIC_CALCULATORS: Dict[str, Type[Any]] = {
+    metric: calculator
+    for calculator in (RollingVWAP, RollingReturns, VolumeProfile)
+    for metric in calculator.metrics
+}
+
+
+@dataclass(slots=True)
+class _Subscription:
+    metrics: FrozenSet[str]
+    handler: MetricHandler
+    instruments: Optional[FrozenSet[str]] = None
+
+
+class AnalyticsStage:
+    """Maintains rolling analytics per instrument and fans them out to subscribers.
+
+    Add the stage to ``StreamConfig.on_ticks``; it receives the ticks decoded by
+    the streamer and calls each subscriber with ``(instrument, metrics)`` where
+    ``metrics`` only contains the names the subscriber registered for.
+    """
+
+    def __init__(self, window: int = 300, tick_size: float = 0.05) -> None:
+        if window < 2:
+            raise ValueError("Analytics window must hold at least two ticks")
+        self.window = window
+        self.tick_size = tick_size
+        self._subscriptions: List[_Subscription] = []
+        self._state: Dict[str, Dict[Type[Any], Any]] = {}
+        self._plans: Dict[str, Tuple[Tuple[Type[Any], ...], Tuple[_Subscription, ...]]] = {}
+        self._day_volume: Dict[str, float] = {}
+
+    def subscribe(
+        self,
+        metrics: Iterable[str],
+        handler: MetricHandler,
+        instruments: Optional[Iterable[str]] = None,
+    ) -> None:
+        """Register ``handler`` for ``metrics``, optionally limited to ``instruments``."""
+
+        requested = frozenset(metrics)
+        unknown = requested - METRIC_CALCULATORS.keys()
+        if unknown:
+            raise ValueError(f"Unknown analytics metrics: {', '.join(sorted(unknown))}")
+        self._subscriptions.append(
+            _Subscription(
+                metrics=requested,
+                handler=handler,
+                instruments=frozenset(instruments) if instruments is not None else None,
+            )
+        )
+        # Subscribers changed, so the per-instrument work plans must be rebuilt.
+        self._plans.clear()
+
+    def _plan(self, instrument: str) -> Tuple[Tuple[Type[Any], ...], Tuple[_Subscription, ...]]:
+        try:
+            return self._plans[instrument]
+        except KeyError:
+            pass
+        subscriptions = tuple(
+            sub
+            for sub in self._subscriptions
+            if sub.instruments is None or instrument in sub.instruments
+        )
+        calculators = tuple(
+            dict.fromkeys(METRIC_CALCULATORS[metric] for sub in subscriptions for metric in sub.metrics)
+        )
+        plan = self._plans[instrument] = (calculators, subscriptions)
+        return plan
+
+    def _calculators(self, instrument: str, calculators: Sequence[Type[Any]]) -> List[Any]:
+        state = self._state.setdefault(instrument, {})
+        instances = []
+        for calculator in calculators:
+            instance = state.get(calculator)
+            if instance is None:
+                instance = state[calculator] = calculator(self.window, self.tick_size)
+            instances.append(instance)
+        return instances
+
+    def __call__(self, ticks: Iterable[Tick]) -> None:
+        for tick in ticks:
+            self.process(tick)
+
+    def _traded(self, instrument: str, volume: Optional[float]) -> float:
+        """Volume traded since the previous tick, from the cumulative day volume.
+
+        Quote and depth updates repeat the last trade's quantity, so that field
+        cannot be summed; the change in day volume counts each trade once. Only
+        call this for priced ticks so the volume of a price-less update is carried
+        into the next priced one instead of being dropped.
+        """
+
+        if volume is None:
+            return 0.0
+        previous = self._day_volume.get(instrument)
+        self._day_volume[instrument] = volume
+        if previous is None or volume < previous:
+            # First sighting or a new session: only establish the baseline.
+            return 0.0
+        return volume - previous
+
+    def process(self, tick: Tick) -> None:
+        """Update the analytics for a single tick and notify subscribers."""
+
+        if tick.price is None:
+            return
+        calculators, subscriptions = self._plan(tick.instrument)
+        if not calculators:
+            return
+        traded = self._traded(tick.instrument, tick.volume)
+        values: Dict[str, Any] = {}
+        for instance in self._calculators(tick.instrument, calculators):
+            instance.update(tick.price, traded)
+            values.update(instance.values())
+        self._notify(tick.instrument, values, subscriptions)
+
+    def snapshot(self, instrument: str) -> Dict[str, Any]:
+        """Return the current value of every metric tracked for ``instrument``."""
+
+        values: Dict[str, Any] = {}
+        for instance in self._state.get(instrument, {}).values():
+            values.update(instance.values())
+        return values
+
+    @staticmethod
+    def _notify(instrument: str, values: Mapping[str, Any], subscriptions: Sequence[_Subscription]) -> None:
+        for sub in subscriptions:
+            sub.handler(instrument, {metric: values[metric] for metric in sub.metrics})
+
+    def process_batch(
+        self,
+        instrument: str,
+        prices: Sequence[float],
+        volumes: Optional[Sequence[float]] = None,
+        notify: bool = True,
+    ) -> Dict[str, Any]:
+        """Compute the rolling metrics for a whole series at once.
+
+        ``volumes`` is the cumulative day volume at each tick (``Tick.volume``);
+        traded volume is derived from its changes exactly as in the live path.
+        Returns NumPy arrays aligned with ``prices`` for ``vwap``, ``returns`` and
+        ``volatility`` (``nan`` until enough data is available) and the final
+        ``volume_profile``. The series replaces any history held for ``instrument``
+        and the incremental state is rebuilt from it, so live ticks continue
+        seamlessly after the batch.
+        """
+
+        import numpy as np
+
+        price_arr = np.asarray(prices, dtype=float)
+        qty_arr = np.zeros_like(price_arr)
+        self._day_volume.pop(instrument, None)
+        if volumes is not None:
+            volume_arr = np.asarray(volumes, dtype=float)
+            known = np.isfinite(volume_arr)
+            if known.any():
+                # Baseline for each tick: the last known day volume strictly before it.
+                last_known = np.maximum.accumulate(np.where(known, np.arange(len(volume_arr)), -1))
+                previous_idx = np.concatenate(([-1], last_known[:-1]))
+                previous = volume_arr[np.maximum(previous_idx, 0)]
+                delta = volume_arr - previous
+                counted = known & (previous_idx >= 0) & (delta >= 0)
+                qty_arr = np.where(counted, delta, 0.0)
+                self._day_volume[instrument] = float(volume_arr[last_known[-1]])
+        calculators, subscriptions = self._plan(instrument)
+        requested = {metric for sub in subscriptions for metric in sub.metrics} or set(METRIC_CALCULATORS)
+        window = self.window
+        results: Dict[str, Any] = {}
+
+        def rolling_sum(values: "np.ndarray") -> "np.ndarray":
+            cumulative = np.concatenate(([0.0], np.cumsum(values)))
+            start = np.maximum(np.arange(1, len(values) + 1) - window, 0)
+            return cumulative[1:] - cumulative[start]
+
+        def carry_forward(mask: "np.ndarray", values: "np.ndarray") -> "np.ndarray":
+            # Spread values computed for the ``mask`` positions to every later tick.
+            last = np.maximum.accumulate(np.where(mask, np.arange(len(mask)), -1))
+            full = np.full_like(price_arr, np.nan)
+            full[mask] = values
+            return np.where(last >= 0, full[np.maximum(last, 0)], np.nan)
+
+        traded = qty_arr > 0
+        if "vwap" in requested:
+            # The live path ignores zero-volume ticks, so the window counts trades only.
+            notional = rolling_sum(price_arr[traded] * qty_arr[traded])
+            volume = rolling_sum(qty_arr[traded])
+            with np.errstate(invalid="ignore", divide="ignore"):
+                vwap = np.where(volume > 0, notional / np.where(volume > 0, volume, 1.0), np.nan)
+            results["vwap"] = carry_forward(traded, vwap)
+
+        # Mirror RollingReturns: a tick is a sample when it trades or moves the price.
+        sampled = np.zeros(len(price_arr), dtype=bool)
+        log_returns = np.full_like(price_arr, np.nan)
+        if len(price_arr) > 1:
+            previous, current = price_arr[:-1], price_arr[1:]
+            sampled[1:] = (traded[1:] | (current != previous)) & (previous > 0) & (current > 0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                log_returns[1:] = np.where(sampled[1:], np.log(current / previous), np.nan)
+        if requested & {"returns", "volatility"}:
+            if "returns" in requested:
+                results["returns"] = log_returns
+            if "volatility" in requested:
+                samples = log_returns[sampled]
+                counts = rolling_sum(np.ones_like(samples))
+                totals = rolling_sum(samples)
+                squares = rolling_sum(samples * samples)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    variance = (squares - totals * totals / counts) / (counts - 1)
+                volatility = np.where(counts > 1, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+                results["volatility"] = carry_forward(sampled, volatility)
+
+        if "volume_profile" in requested:
+            levels = np.round(price_arr[traded] / self.tick_size)[-window:]
+            volumes = qty_arr[traded][-window:]
+            unique, inverse = np.unique(levels, return_inverse=True)
+            totals = np.bincount(inverse, weights=volumes, minlength=len(unique))
+            results["volume_profile"] = {
+                float(level * self.tick_size): float(total) for level, total in zip(unique, totals)
+            }
+
+        # The batch becomes the instrument's history: rebuild the live state by
+        # replaying only the tail that still falls inside the windows.
+        tail = max(len(price_arr) - 1, 0)
+        trade_positions = np.flatnonzero(traded)
+        if len(trade_positions):
+            tail = min(tail, int(trade_positions[-min(window, len(trade_positions))]))
+        sample_positions = np.flatnonzero(sampled)
+        if len(sample_positions):
+            # Start one tick early so the first replayed return has its previous price.
+            tail = min(tail, int(sample_positions[-min(window, len(sample_positions))]) - 1)
+        self._state.pop(instrument, None)
+        for instance in self._calculators(instrument, calculators):
+            for price, quantity in zip(price_arr[tail:].tolist(), qty_arr[tail:].tolist()):
+                instance.update(price, quantity)
+        if notify and subscriptions and len(price_arr):
+            self._notify(instrument, self.snapshot(instrument), subscriptions)
+        return results
@@ -0,0 +1,157 @@
+"""Last-value cache holding the most recent quote for every streamed instrument."""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .config import Tick
+
+
+@dataclass(slots=True)
+class Quote:
+    """The latest known values for an instrument.
+
+    ``volume`` is the cumulative session volume reported with the latest tick
+    that carried one. ``sequence`` is the cache-wide update counter at the time the quote was
+    written; pass the highest value seen to :meth:`LastValueCache.snapshot` to
+    fetch only quotes that changed since.
+    """
+
+    instrument: str
+    price: Optional[float]
+    quantity: Optional[float]
+    volume: Optional[float]
+    exchange_ts: Optional[float]
+    received_at: float
+    sequence: int
+
+
+class LastValueCache:
+    """Fixed slots per instrument, updated in place by the streamer.
+
+    Each slot carries a version counter that is odd while a write is in
+    progress. Readers retry until they observe the same even version before and
+    after copying a slot, so a quote read from another thread (e.g. the web app)
+    is never torn across two updates.
+    """
+
+    def __init__(
+        self,
+        instruments: Iterable[str] = (),
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._clock = clock
+        self._slots: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._versions: List[int] = []
+        self._sequences: List[int] = []
+        self._prices: List[Optional[float]] = []
+        self._quantities: List[Optional[float]] = []
+        self._volumes: List[Optional[float]] = []
+        self._exchange_ts: List[Optional[float]] = []
+        self._received: List[float] = []
+        self.sequence = 0
+        self.reserve(instruments)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, instrument: object) -> bool:
+        return instrument in self._slots
+
+    def instruments(self) -> List[str]:
+        return list(self._names)
+
+    def reserve(self, instruments: Iterable[str]) -> None:
+        """Preallocate slots so the first tick for each instrument does not grow the cache."""
+
+        for instrument in instruments:
+            self._slot(instrument)
+
+    def _slot(self, instrument: str) -> int:
+        slot = self._slots.get(instrument)
+        if slot is not None:
+            return slot
+        slot = len(self._names)
+        self._versions.append(0)
+        self._sequences.append(0)
+        self._prices.append(None)
+        self._quantities.append(None)
+        self._volumes.append(None)
+        self._exchange_ts.append(None)
+        self._received.append(0.0)
+        self._names.append(instrument)
+        # Publish the slot last so concurrent readers never see a half-built entry.
+        self._slots[instrument] = slot
+        return slot
+
+    def update(self, tick: Tick, received_at: Optional[float] = None) -> None:
+        """Write ``tick`` into its slot, keeping previous values for fields it lacks."""
+
+        slot = self._slot(tick.instrument)
+        self._versions[slot] += 1
+        if tick.price is not None:
+            self._prices[slot] = tick.price
+        if tick.quantity is not None:
+            self._quantities[slot] = tick.quantity
+        if tick.volume is not None:
+            self._volumes[slot] = tick.volume
+        if tick.exchange_ts is not None:
+            self._exchange_ts[slot] = tick.exchange_ts
+        self._received[slot] = self._clock() if received_at is None else received_at
+        self.sequence += 1
+        self._sequences[slot] = self.sequence
+        self._versions[slot] += 1
+
+    def _read(self, slot: int) -> Optional[Quote]:
+        versions = self._versions
+        while True:
+            before = versions[slot]
+            if before & 1:
+                time.sleep(0)
+                continue
+            quote = Quote(
+                instrument=self._names[slot],
+                price=self._prices[slot],
+                quantity=self._quantities[slot],
+                volume=self._volumes[slot],
+                exchange_ts=self._exchange_ts[slot],
+                received_at=self._received[slot],
+                sequence=self._sequences[slot],
+            )
+            if versions[slot] == before:
+                # Reserved slots that never received a tick have nothing to report.
+                return quote if before else None
+
+    def get(self, instrument: str) -> Optional[Quote]:
+        """Return the latest quote for ``instrument`` or ``None`` if none has arrived."""
+
+        slot = self._slots.get(instrument)
+        if slot is None:
+            return None
+        return self._read(slot)
+
+    def snapshot(
+        self,
+        instruments: Optional[Iterable[str]] = None,
+        since: int = 0,
+    ) -> Dict[str, Quote]:
+        """Return the latest quotes for ``instruments`` (default: all of them).
+
+        Only quotes updated after sequence ``since`` are included, so pollers can
+        request just what changed since their previous snapshot.
+        """
+
+        if instruments is None:
+            slots = range(len(self._names))
+        else:
+            slots = [self._slots[name] for name in instruments if name in self._slots]
+        quotes: Dict[str, Quote] = {}
+        for slot in slots:
+            if self._sequences[slot] <= since:
+                continue
+            quote = self._read(slot)
+            if quote is not None and quote.sequence > since:
+                quotes[quote.instrument] = quote
+        return quotes
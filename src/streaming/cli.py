@@ -2,16 +2,20 @@
 from __future__ import annotations
 
 import argparse
-import asyncio
 from typing import List
 
 from .config import CredentialSet, Instrument, StreamConfig
-from .factory import STREAMER_REGISTRY, create_auth_service, create_streamer
+from .factory import AUTH_REGISTRY, STREAMER_REGISTRY, create_auth_service, create_streamer
 
 
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Unified data streaming CLI")
-    parser.add_argument("provider", choices=sorted(STREAMER_REGISTRY.keys()), help="Provider to use")
+    # No ``choices``: listing every provider would scan installed plugins on each start.
+    parser.add_argument(
+        "provider",
+        help=f"Provider to use (built-in: {', '.join(sorted(STREAMER_REGISTRY.registered()))}; "
+        "plugins are also accepted)",
+    )
     parser.add_argument("symbols", nargs="*", help="Symbols or instrument tokens to subscribe")
     parser.add_argument("--exchange", dest="exchange", help="Exchange segment to use for all symbols")
     parser.add_argument("--token", dest="use_token", action="store_true", help="Treat symbols as instrument tokens")
@@ -23,6 +27,13 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--username", help="Login username")
     parser.add_argument("--password", help="Login password")
     parser.add_argument("--totp-secret", help="TOTP secret for MFA flows")
+    parser.add_argument(
+        "--serve-quotes",
+        type=int,
+        metavar="PORT",
+        help="Serve the last-value cache over HTTP (/api/quotes) on PORT while streaming",
+    )
+    parser.add_argument("--serve-host", default="127.0.0.1", help="Host for --serve-quotes")
     return parser
 
 
@@ -53,6 +64,10 @@ def _build_instruments(args: argparse.Namespace) -> List[Instrument]:
 def main(argv: list[str] | None = None) -> None:  # pragma: no cover - CLI utility
     parser = _build_parser()
     args = parser.parse_args(argv)
+    provider = args.provider.lower()
+    # Authentication runs first, so a plugin must provide both halves to be usable.
+    if provider not in STREAMER_REGISTRY or provider not in AUTH_REGISTRY:
+        parser.error(f"unsupported provider '{args.provider}'")
 
     credentials = _build_credentials(args)
     auth_service = create_auth_service(args.provider, credentials)
@@ -63,14 +78,31 @@ def main(argv: list[str] | None = None) -> None:  # pragma: no cover - CLI utili
         return
 
     instruments = _build_instruments(args)
+    streamer = create_streamer(args.provider, credentials)
+    # Only websocket streamers keep a last-value cache; plugin streamers may not.
+    last_values = getattr(streamer, "last_values", None)
+    if args.serve_quotes is not None and last_values is None:
+        parser.error(f"--serve-quotes is not supported by provider '{args.provider}' (no last-value cache)")
+    # asyncio is only needed for streaming; token-only runs skip its import cost.
+    import asyncio
 
     async def _run() -> None:
-        streamer = create_streamer(args.provider, credentials)
         config = StreamConfig(
             instruments=instruments,
             on_message=lambda payload: print(payload),
         )
-        await streamer.stream(config)
+        server = None
+        if args.serve_quotes is not None:
+            # Flask is only imported when the quote API is requested.
+            from .web.app import start_quote_server
+
+            server = start_quote_server(last_values, args.serve_host, args.serve_quotes)
+            print(f"Serving quotes on http://{args.serve_host}:{args.serve_quotes}/api/quotes")
+        try:
+            await streamer.stream(config)
+        finally:
+            if server is not None:
+                server.shutdown()
 
     asyncio.run(_run())
 
@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Callable, Optional, Sequence
+from datetime import time
+from typing import Callable, List, Optional, Sequence, Tuple, Union
 
 
 @dataclass(slots=True)
@@ -14,17 +15,74 @@ class Instrument:
     token: Optional[str] = None
 
 
+@dataclass(slots=True)
+class Tick:
+    """A normalised trade/quote update decoded from a provider message.
+
+    ``exchange_ts`` is the feed's timestamp for the update (epoch seconds): the
+    packet timestamp where the provider sends one, otherwise the last trade time.
+    ``quantity`` is the last trade's size, which quote updates repeat; ``volume``
+    is the cumulative volume traded in the session, whose changes give the
+    volume actually traded between ticks.
+    """
+
+    instrument: str
+    price: Optional[float] = None
+    quantity: Optional[float] = None
+    exchange_ts: Optional[float] = None
+    volume: Optional[float] = None
+
+
+@dataclass(slots=True, frozen=True)
+class WatchdogConfig:
+    """Thresholds used by the feed health watchdog.
+
+    Silences and latencies are expressed in seconds. A threshold set to ``None``
+    disables that particular check. Checks only run inside market hours; set
+    ``market_open``/``market_close`` to ``None`` to enforce them around the clock.
+    """
+
+    enabled: bool = True
+    max_silence: Optional[float] = 30.0
+    max_instrument_silence: Optional[float] = None
+    max_latency: Optional[float] = None
+    latency_percentile: float = 0.99
+    latency_window: int = 1024
+    min_latency_samples: int = 50
+    check_interval: float = 1.0
+    market_open: Optional[time] = time(9, 15)
+    market_close: Optional[time] = time(15, 30)
+    market_days: Tuple[int, ...] = (0, 1, 2, 3, 4)
+    market_timezone: str = "Asia/Kolkata"
+
+
+TickHandler = Callable[[List[Tick]], None]
+
+
 @dataclass(slots=True)
 class StreamConfig:
-    """Configuration for a streaming session."""
+    """Configuration for a streaming session.
+
+    ``on_ticks`` takes a single handler or a sequence of handlers, e.g. an
+    analytics stage and an option chain stage, each called with every batch of
+    decoded ticks in order.
+
+    ``max_retries`` bounds consecutive failed connections. The budget is restored
+    once a connection has stayed healthy for ``retry_reset_after`` seconds, so
+    occasional watchdog reconnects in a long session do not exhaust it; keep it
+    above the watchdog's ``max_silence``.
+    """
 
     instruments: Sequence[Instrument]
     on_message: Callable[[dict], None]
+    on_ticks: Union[TickHandler, Sequence[TickHandler], None] = None
     on_error: Optional[Callable[[Exception], None]] = None
     on_disconnect: Optional[Callable[[], None]] = None
     reconnect: bool = True
     max_retries: int = 5
     retry_backoff: float = 2.0
+    retry_reset_after: float = 60.0
+    watchdog: Optional[WatchdogConfig] = None
 
 
 @dataclass(slots=True)
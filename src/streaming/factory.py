@@ -1,29 +1,117 @@
-"""Factory helpers to construct streamers and auth services."""
+"""Factory helpers to construct streamers and auth services.
+
+Provider classes are registered by dotted path and only imported on first use,
+so listing providers (e.g. for ``--help``) does not pull in the network and
+parsing dependencies of every broker. Third-party providers can register
+themselves through the ``streaming.streamers`` and ``streaming.auth`` entry
+point groups using the same ``module:attribute`` syntax.
+"""
 from __future__ import annotations
 
-from typing import Dict, Type
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Mapping, Optional
 
-from .auth.base import AuthService
-from .auth.dhan import DhanHQAuthService
-from .auth.upstox import UpstoxAuthService
-from .auth.zerodha import ZerodhaAuthService
 from .config import CredentialSet
-from .providers.base import BaseDataStreamer
-from .providers.dhan import DhanHQStreamer
-from .providers.upstox import UpstoxStreamer
-from .providers.zerodha import ZerodhaStreamer
-
-STREAMER_REGISTRY: Dict[str, Type[BaseDataStreamer]] = {
-    "upstox": UpstoxStreamer,
-    "dhan": DhanHQStreamer,
-    "zerodha": ZerodhaStreamer,
-}
-
-AUTH_REGISTRY: Dict[str, Type[AuthService]] = {
-    "upstox": UpstoxAuthService,
-    "dhan": DhanHQAuthService,
-    "zerodha": ZerodhaAuthService,
-}
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .auth.base import AuthService
+    from .providers.base import BaseDataStreamer
+
+STREAMER_ENTRY_POINT_GROUP = "streaming.streamers"
+AUTH_ENTRY_POINT_GROUP = "streaming.auth"
+
+
+def _resolve(path: str) -> Any:
+    module_name, _, attribute = path.partition(":")
+    if not attribute:
+        module_name, _, attribute = module_name.rpartition(".")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class LazyRegistry(Mapping[str, type]):
+    """Mapping of provider names to classes resolved from dotted paths on first access."""
+
+    def __init__(self, paths: Dict[str, str], entry_point_group: Optional[str] = None) -> None:
+        self._paths = dict(paths)
+        self._classes: Dict[str, type] = {}
+        self._entry_point_group = entry_point_group
+        self._discovered = entry_point_group is None
+
+    def register(self, name: str, target: Any) -> None:
+        """Register a provider by dotted path (``"pkg.module:Class"``) or class object."""
+
+        name = name.lower()
+        if isinstance(target, str):
+            self._paths[name] = target
+            self._classes.pop(name, None)
+        else:
+            self._classes[name] = target
+
+    def _discover(self) -> None:
+        if self._discovered:
+            return
+        self._discovered = True
+        # Imported here: importlib.metadata is comparatively slow to import.
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=self._entry_point_group):
+            # Built-in providers win over plugins that reuse their name.
+            self._paths.setdefault(entry_point.name.lower(), entry_point.value)
+
+    def registered(self) -> List[str]:
+        """Return the names known without scanning entry points (built-ins and ``register``)."""
+
+        return list(dict.fromkeys([*self._paths, *self._classes]))
+
+    def _names(self) -> Dict[str, None]:
+        self._discover()
+        return dict.fromkeys([*self._paths, *self._classes])
+
+    def __getitem__(self, name: str) -> type:
+        name = name.lower()
+        try:
+            return self._classes[name]
+        except KeyError:
+            pass
+        if name not in self._paths:
+            self._discover()
+        path = self._paths[name]
+        cls = self._classes[name] = _resolve(path)
+        return cls
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        name = name.lower()
+        if name in self._paths or name in self._classes:
+            return True
+        # Only unknown names pay for the entry point scan.
+        return name in self._names()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names())
+
+    def __len__(self) -> int:
+        return len(self._names())
+
+
+STREAMER_REGISTRY = LazyRegistry(
+    {
+        "upstox": f"{__package__}.providers.upstox:UpstoxStreamer",
+        "dhan": f"{__package__}.providers.dhan:DhanHQStreamer",
+        "zerodha": f"{__package__}.providers.zerodha:ZerodhaStreamer",
+    },
+    entry_point_group=STREAMER_ENTRY_POINT_GROUP,
+)
+
+AUTH_REGISTRY = LazyRegistry(
+    {
+        "upstox": f"{__package__}.auth.upstox:UpstoxAuthService",
+        "dhan": f"{__package__}.auth.dhan:DhanHQAuthService",
+        "zerodha": f"{__package__}.auth.zerodha:ZerodhaAuthService",
+    },
+    entry_point_group=AUTH_ENTRY_POINT_GROUP,
+)
 
 
 def create_streamer(provider: str, credentials: CredentialSet) -> BaseDataStreamer:
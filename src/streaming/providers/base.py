@@ -4,18 +4,63 @@ from __future__ import annotations
 import abc
 import asyncio
 import json
-from typing import Any, Dict, Optional
+import time
+from datetime import datetime, tzinfo
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
 
 import websockets
 from websockets.client import WebSocketClientProtocol
 
-from ..config import CredentialSet, Instrument, StreamConfig
+from ..cache import LastValueCache
+from ..config import CredentialSet, Instrument, StreamConfig, Tick, WatchdogConfig
+from ..watchdog import FeedWatchdog
+
+# Epoch values above this are treated as milliseconds rather than seconds.
+_MILLISECOND_THRESHOLD = 1e11
 
 
 class StreamingError(RuntimeError):
     """Raised when a streaming provider experiences an unrecoverable error."""
 
 
+class FeedStalledError(StreamingError):
+    """Raised when the watchdog finds a feed silent or lagging beyond its thresholds."""
+
+
+def as_float(value: Any) -> Optional[float]:
+    """Coerce a numeric field from a provider payload, returning ``None`` when absent."""
+
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def exchange_time(value: Any, tz: tzinfo) -> Optional[float]:
+    """Convert an exchange timestamp to epoch seconds.
+
+    Accepts epoch seconds or milliseconds (as numbers or numeric strings) and ISO
+    formatted datetimes. Naive datetimes are interpreted in ``tz``.
+    """
+
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            pass
+        else:
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=tz)
+            return parsed.timestamp()
+    seconds = as_float(value)
+    if seconds is not None and seconds > _MILLISECOND_THRESHOLD:
+        seconds /= 1000.0
+    return seconds
+
+
 class BaseDataStreamer(abc.ABC):
     """Abstract base class for all provider streamers."""
 
@@ -31,15 +76,25 @@ class WebsocketDataStreamer(BaseDataStreamer):
     """Helper base class for providers that use websocket feeds."""
 
     websocket_url: str
+    exchange_timezone: tzinfo = ZoneInfo("Asia/Kolkata")
+    # Per-provider watchdog thresholds, overridden by ``StreamConfig.watchdog``.
+    watchdog_config: WatchdogConfig = WatchdogConfig()
 
     def __init__(self, credentials: CredentialSet) -> None:
         super().__init__(credentials)
         self._ws: Optional[WebSocketClientProtocol] = None
         self._lock = asyncio.Lock()
+        self.watchdog: Optional[FeedWatchdog] = None
+        self.last_values = LastValueCache()
+        self._first_message_at: Optional[float] = None
+        self._last_message_at = 0.0
 
     async def stream(self, config: StreamConfig) -> None:  # pragma: no cover - network heavy
+        self.last_values.reserve(self.instrument_key(inst) for inst in config.instruments)
         retries = 0
         while True:
+            self.watchdog = None
+            self._first_message_at = None
             try:
                 await self._connect()
                 await self._subscribe(config)
@@ -49,6 +104,10 @@ class WebsocketDataStreamer(BaseDataStreamer):
             except asyncio.CancelledError:
                 raise
             except Exception as exc:  # pragma: no cover - runtime safety
+                if self._healthy_span() >= config.retry_reset_after:
+                    # A long healthy run means this is a fresh incident rather than a
+                    # repeat of the last one, so restore the failure budget and backoff.
+                    retries = 0
                 if config.on_error:
                     config.on_error(exc)
                 if not config.reconnect or retries >= config.max_retries:
@@ -60,6 +119,16 @@ class WebsocketDataStreamer(BaseDataStreamer):
             finally:
                 await self._disconnect()
 
+    def _healthy_span(self) -> float:
+        """How long the current connection was demonstrably healthy before it ended."""
+
+        watchdog = self.watchdog
+        if watchdog is not None and watchdog.in_market_hours():
+            return watchdog.healthy_span
+        if self._first_message_at is None:
+            return 0.0
+        return self._last_message_at - self._first_message_at
+
     async def _connect(self) -> None:
         async with self._lock:
             if self._ws and not self._ws.closed:
@@ -74,8 +143,50 @@ class WebsocketDataStreamer(BaseDataStreamer):
 
     async def _listen(self, config: StreamConfig) -> None:
         assert self._ws is not None
+        watchdog_config = config.watchdog or self.watchdog_config
+        if not watchdog_config.enabled:
+            self.watchdog = None
+            await self._consume(config, None)
+            return
+
+        # A fresh watchdog per connection so reconnects start with clean tick ages.
+        self.watchdog = FeedWatchdog(
+            watchdog_config, instruments=[self.instrument_key(inst) for inst in config.instruments]
+        )
+        consumer = asyncio.ensure_future(self._consume(config, self.watchdog))
+        monitor = asyncio.ensure_future(self.watchdog.monitor())
+        try:
+            done, _ = await asyncio.wait({consumer, monitor}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            consumer.cancel()
+            monitor.cancel()
+            await asyncio.gather(consumer, monitor, return_exceptions=True)
+        if consumer in done:
+            consumer.result()
+        else:
+            # Raising lets ``stream`` tear down the connection and reconnect.
+            raise FeedStalledError(monitor.result())
+
+    async def _consume(self, config: StreamConfig, watchdog: Optional[FeedWatchdog]) -> None:
+        assert self._ws is not None
+        last_values = self.last_values
+        tick_handlers = config.on_ticks or ()
+        if callable(tick_handlers):
+            tick_handlers = (tick_handlers,)
         async for message in self._ws:
+            received = watchdog.record_message() if watchdog is not None else time.monotonic()
+            if self._first_message_at is None:
+                self._first_message_at = received
+            self._last_message_at = received
             payload = self._parse_message(message)
+            ticks = self.decode_ticks(payload)
+            for tick in ticks:
+                last_values.update(tick)
+                if watchdog is not None:
+                    watchdog.record_tick(tick.instrument, tick.exchange_ts, received)
+            if ticks:
+                for handler in tick_handlers:
+                    handler(ticks)
             config.on_message(payload)
 
     async def send_json(self, payload: Dict[str, Any]) -> None:
@@ -96,6 +207,16 @@ class WebsocketDataStreamer(BaseDataStreamer):
     async def _subscribe(self, config: StreamConfig) -> None:
         """Send the subscription message once connected."""
 
+    def instrument_key(self, instrument: Instrument) -> str:
+        """Return the key this provider's ticks use to identify ``instrument``."""
+
+        return instrument.token or instrument.symbol
+
+    def decode_ticks(self, payload: Dict[str, Any]) -> List[Tick]:
+        """Extract the normalised ticks carried by a parsed message."""
+
+        return []
+
     def _parse_message(self, message: str) -> Dict[str, Any]:
         try:
             return json.loads(message)
@@ -1,14 +1,17 @@
 """Dhan HQ websocket streamer implementation."""
 from __future__ import annotations
 
-from .base import WebsocketDataStreamer
-from ..config import Instrument, StreamConfig
+from typing import Any, Dict, List
+
+from .base import WebsocketDataStreamer, as_float, exchange_time
+from ..config import Instrument, StreamConfig, Tick, WatchdogConfig
 
 
 class DhanHQStreamer(WebsocketDataStreamer):
     """Streams market data from the DhanHQ websocket feed."""
 
     websocket_url = "wss://api-feed.dhan.co/v1/ws/marketData"
+    watchdog_config = WatchdogConfig(max_silence=20.0, max_latency=3.0)
 
     async def _subscribe(self, config: StreamConfig) -> None:
         instruments = [self._instrument_payload(inst) for inst in config.instruments]
@@ -28,3 +31,18 @@ class DhanHQStreamer(WebsocketDataStreamer):
             "exchangeSegment": exchange_segment,
             "exchangeInstrumentID": token,
         }
+
+    def decode_ticks(self, payload: Dict[str, Any]) -> List[Tick]:
+        instrument_id = payload.get("exchangeInstrumentID") or payload.get("securityId")
+        if instrument_id is None:
+            return []
+        timestamp = payload.get("LTT") or payload.get("lastTradeTime")
+        return [
+            Tick(
+                instrument=str(instrument_id),
+                price=as_float(payload.get("LTP")),
+                quantity=as_float(payload.get("LTQ")),
+                exchange_ts=exchange_time(timestamp, self.exchange_timezone),
+                volume=as_float(payload.get("volume")),
+            )
+        ]
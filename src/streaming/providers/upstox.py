@@ -2,15 +2,17 @@
 from __future__ import annotations
 
 import uuid
+from typing import Any, Dict, List
 
-from .base import WebsocketDataStreamer
-from ..config import Instrument, StreamConfig
+from .base import WebsocketDataStreamer, as_float, exchange_time
+from ..config import Instrument, StreamConfig, Tick, WatchdogConfig
 
 
 class UpstoxStreamer(WebsocketDataStreamer):
     """Streams market data from the Upstox websocket feed."""
 
     websocket_url = "wss://socket-v2.upstox.com/feed/market-data-streamer/v2"
+    watchdog_config = WatchdogConfig(max_silence=15.0, max_latency=3.0)
 
     async def _subscribe(self, config: StreamConfig) -> None:
         instrument_keys = [self._instrument_key(inst) for inst in config.instruments]
@@ -24,9 +26,33 @@ class UpstoxStreamer(WebsocketDataStreamer):
         }
         await self.send_json(payload)
 
+    def instrument_key(self, instrument: Instrument) -> str:
+        return self._instrument_key(instrument)
+
     def _instrument_key(self, instrument: Instrument) -> str:
         if instrument.token:
             return instrument.token
         if instrument.exchange:
             return f"{instrument.exchange}:{instrument.symbol}"
         return instrument.symbol
+
+    def decode_ticks(self, payload: Dict[str, Any]) -> List[Tick]:
+        ticks = []
+        # ``currentTs`` stamps the whole packet; ``ltt`` only moves when the instrument trades.
+        packet_ts = exchange_time(payload.get("currentTs"), self.exchange_timezone)
+        feeds = payload.get("feeds") or {}
+        for instrument_key, feed in feeds.items():
+            feed = feed or {}
+            full_feed = feed.get("ff") or {}
+            market = full_feed.get("marketFF") or full_feed.get("indexFF") or {}
+            ltpc = market.get("ltpc") or feed.get("ltpc") or {}
+            ticks.append(
+                Tick(
+                    instrument=instrument_key,
+                    price=as_float(ltpc.get("ltp")),
+                    quantity=as_float(ltpc.get("ltq")),
+                    exchange_ts=packet_ts or exchange_time(ltpc.get("ltt"), self.exchange_timezone),
+                    volume=as_float(market.get("vtt")),
+                )
+            )
+        return ticks
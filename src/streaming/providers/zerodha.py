@@ -1,14 +1,19 @@
 """Zerodha Kite Connect websocket streamer."""
 from __future__ import annotations
 
-from .base import WebsocketDataStreamer
-from ..config import Instrument, StreamConfig
+from typing import Any, Dict, List
+
+from .base import WebsocketDataStreamer, as_float, exchange_time
+from ..config import Instrument, StreamConfig, Tick, WatchdogConfig
 
 
 class ZerodhaStreamer(WebsocketDataStreamer):
     """Streams market data from the Zerodha Kite websocket."""
 
     websocket_url = "wss://ws.kite.trade/"
+    # Kite's exchange_timestamp has one-second resolution, which inflates every latency
+    # sample by up to a second; the bound allows for that on top of ~2s of real lag.
+    watchdog_config = WatchdogConfig(max_silence=10.0, max_latency=3.0)
 
     async def _subscribe(self, config: StreamConfig) -> None:
         tokens = [self._instrument_token(inst) for inst in config.instruments]
@@ -32,3 +37,18 @@ class ZerodhaStreamer(WebsocketDataStreamer):
         if token is None:
             raise ValueError("Zerodha streaming requires the numeric instrument token")
         return int(token)
+
+    def decode_ticks(self, payload: Dict[str, Any]) -> List[Tick]:
+        token = payload.get("instrument_token")
+        if token is None:
+            return []
+        quantity = payload.get("last_traded_quantity", payload.get("last_quantity"))
+        return [
+            Tick(
+                instrument=str(token),
+                price=as_float(payload.get("last_price")),
+                quantity=as_float(quantity),
+                exchange_ts=exchange_time(payload.get("exchange_timestamp"), self.exchange_timezone),
+                volume=as_float(payload.get("volume_traded", payload.get("volume"))),
+            )
+        ]
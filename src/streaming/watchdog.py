@@ -0,0 +1,186 @@
+"""Feed health watchdog for websocket streamers."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Deque, Dict, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+from .config import WatchdogConfig
+
+
+@dataclass(slots=True)
+class FeedHealth:
+    """Point-in-time view of a connection's health."""
+
+    in_market_hours: bool
+    messages: int
+    silence: float
+    instrument_silence: Dict[str, float] = field(default_factory=dict)
+    instrument_latency: Dict[str, float] = field(default_factory=dict)
+    latency_samples: int = 0
+    latency_p50: Optional[float] = None
+    latency_p99: Optional[float] = None
+    latency_max: Optional[float] = None
+
+
+class FeedWatchdog:
+    """Tracks tick age and exchange-to-receive latency for a single connection.
+
+    Receive times come from a monotonic clock. To compare them with exchange
+    timestamps the watchdog anchors the monotonic clock to wall time once per
+    connection, so wall clock adjustments mid-session do not skew the latency.
+    """
+
+    def __init__(
+        self,
+        config: WatchdogConfig,
+        instruments: Iterable[str] = (),
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.config = config
+        self.timezone = ZoneInfo(config.market_timezone)
+        self._clock = clock
+        self._mono_anchor = clock()
+        self._wall_anchor = wall_clock()
+        self._last_message = self._mono_anchor
+        self._armed_at: Optional[float] = None
+        self._healthy_since: Optional[float] = None
+        self._healthy_until = 0.0
+        self._streak_open = False
+        # Subscribed instruments start the clock at connect, so one that never ticks is flagged too.
+        self._last_tick: Dict[str, float] = dict.fromkeys(instruments, self._mono_anchor)
+        self._last_exchange_ts: Dict[str, float] = {}
+        self._last_latency: Dict[str, float] = {}
+        self._latencies: Deque[float] = deque(maxlen=config.latency_window)
+        self.messages = 0
+
+    def record_message(self) -> float:
+        """Mark a message as received and return its monotonic receive time."""
+
+        received = self._clock()
+        self._last_message = received
+        self.messages += 1
+        return received
+
+    def record_tick(self, instrument: str, exchange_ts: Optional[float], received: float) -> None:
+        """Record a tick for ``instrument`` received at monotonic time ``received``."""
+
+        self._last_tick[instrument] = received
+        if exchange_ts is None:
+            return
+        previous = self._last_exchange_ts.get(instrument)
+        self._last_exchange_ts[instrument] = exchange_ts
+        # Quote and depth updates repeat the last trade time; only a timestamp that moved
+        # forward describes this update, and the first one seen may be arbitrarily stale.
+        if previous is None or exchange_ts <= previous:
+            return
+        latency = self._wall_anchor + (received - self._mono_anchor) - exchange_ts
+        self._last_latency[instrument] = latency
+        self._latencies.append(latency)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, max(0, int(round(percentile * len(ordered))) - 1))
+        return ordered[index]
+
+    def in_market_hours(self, now: Optional[datetime] = None) -> bool:
+        config = self.config
+        if config.market_open is None or config.market_close is None:
+            return True
+        now = now or datetime.now(self.timezone)
+        if now.weekday() not in config.market_days:
+            return False
+        return config.market_open <= now.time() < config.market_close
+
+    @property
+    def healthy_span(self) -> float:
+        """Seconds covered by the latest streak of checks that showed a live, timely feed.
+
+        A failed check closes the streak but keeps its length, so after a stall this
+        tells how long the connection was healthy before it.
+        """
+
+        if self._healthy_since is None:
+            return 0.0
+        return self._healthy_until - self._healthy_since
+
+    def check(self) -> Optional[str]:
+        """Return the reason the feed is unhealthy, or ``None`` when it is within bounds."""
+
+        if not self.in_market_hours():
+            self._armed_at = None
+            return None
+        now = self._clock()
+        if self._armed_at is None:
+            # Silence is measured from the later of the market open and the last message
+            # so a connection opened before the bell is not flagged the moment it rings.
+            self._armed_at = now
+
+        reason = self._violation(now)
+        config = self.config
+        if reason is not None:
+            self._streak_open = False
+        elif self.messages and (
+            config.max_latency is None or len(self._latencies) >= config.min_latency_samples
+        ):
+            # Only checks backed by evidence extend the streak: a connection without enough
+            # latency samples yet proves nothing about latency.
+            if not self._streak_open:
+                self._streak_open = True
+                self._healthy_since = now
+            self._healthy_until = now
+        return reason
+
+    def _violation(self, now: float) -> Optional[str]:
+        config = self.config
+        if config.max_silence is not None:
+            silence = now - max(self._last_message, self._armed_at)
+            if silence > config.max_silence:
+                return f"No messages received for {silence:.1f}s"
+
+        if config.max_instrument_silence is not None:
+            for instrument, last_tick in self._last_tick.items():
+                silence = now - max(last_tick, self._armed_at)
+                if silence > config.max_instrument_silence:
+                    return f"No ticks for instrument {instrument} for {silence:.1f}s"
+
+        if config.max_latency is not None and len(self._latencies) >= config.min_latency_samples:
+            latency = self.latency_percentile(config.latency_percentile)
+            if latency is not None and latency > config.max_latency:
+                return (
+                    f"Exchange-to-receive latency p{config.latency_percentile * 100:g} "
+                    f"is {latency:.3f}s"
+                )
+        return None
+
+    async def monitor(self) -> str:
+        """Poll :meth:`check` until the feed becomes unhealthy and return the reason."""
+
+        while True:
+            await asyncio.sleep(self.config.check_interval)
+            reason = self.check()
+            if reason is not None:
+                return reason
+
+    def snapshot(self) -> FeedHealth:
+        now = self._clock()
+        return FeedHealth(
+            in_market_hours=self.in_market_hours(),
+            messages=self.messages,
+            silence=now - self._last_message,
+            instrument_silence={
+                instrument: now - last_tick for instrument, last_tick in self._last_tick.items()
+            },
+            instrument_latency=dict(self._last_latency),
+            latency_samples=len(self._latencies),
+            latency_p50=self.latency_percentile(0.5),
+            latency_p99=self.latency_percentile(0.99),
+            latency_max=max(self._latencies) if self._latencies else None,
+        )
@@ -2,16 +2,23 @@
 from __future__ import annotations
 
 import os
+import threading
 from dataclasses import asdict
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from flask import Flask, flash, redirect, render_template, request, url_for
+from flask import Flask, abort, flash, jsonify, redirect, render_template, request, url_for
+from werkzeug.serving import BaseWSGIServer, make_server
 
+from ..cache import LastValueCache
 from ..config import CredentialSet
 from ..factory import AUTH_REGISTRY, create_auth_service
 
 _TOKEN_HISTORY_LIMIT = 20
+_NO_STREAM_RESPONSE = (
+    {"error": "No live stream is attached; start one with 'streaming.cli --serve-quotes'."},
+    503,
+)
 
 
 def _optional_value(form: Dict[str, str], key: str) -> Optional[str]:
@@ -31,12 +38,24 @@ def _build_credentials(form: Dict[str, str]) -> CredentialSet:
     )
 
 
-def create_app() -> Flask:
-    """Create and configure the Flask app."""
+def _quote_instruments(args: Dict[str, str]) -> Optional[List[str]]:
+    value = (args.get("instruments") or "").strip()
+    if not value:
+        return None
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def create_app(last_values: Optional[LastValueCache] = None) -> Flask:
+    """Create and configure the Flask app.
+
+    Pass a streamer's ``last_values`` cache to serve its quotes from ``/api/quotes``;
+    without one the quote routes answer 503 rather than an always-empty cache.
+    """
 
     app = Flask(__name__, template_folder="templates")
     app.secret_key = os.environ.get("STREAMING_WEB_SECRET", "dev-secret")
     token_history: List[Dict[str, Any]] = []
+    quotes = last_values
 
     @app.context_processor
     def inject_shared_context() -> Dict[str, Any]:
@@ -76,7 +95,46 @@ def create_app() -> Flask:
 
         return render_template("index.html", generated_tokens=generated_tokens)
 
+    @app.route("/api/quotes")
+    def list_quotes() -> Any:
+        if quotes is None:
+            return _NO_STREAM_RESPONSE
+        try:
+            since = int(request.args.get("since", 0))
+        except ValueError:
+            return jsonify({"error": "'since' must be an integer"}), 400
+        # Read the sequence first: anything updated meanwhile is re-sent next poll.
+        sequence = quotes.sequence
+        snapshot = quotes.snapshot(_quote_instruments(request.args), since=since)
+        return jsonify(
+            {
+                "sequence": sequence,
+                "quotes": {name: asdict(quote) for name, quote in snapshot.items()},
+            }
+        )
+
+    @app.route("/api/quotes/<path:instrument>")
+    def get_quote(instrument: str) -> Any:
+        if quotes is None:
+            return _NO_STREAM_RESPONSE
+        quote = quotes.get(instrument)
+        if quote is None:
+            abort(404)
+        return jsonify(asdict(quote))
+
     return app
 
 
+def start_quote_server(last_values: LastValueCache, host: str, port: int) -> BaseWSGIServer:
+    """Serve the app for ``last_values`` from a daemon thread and return the server.
+
+    Lets the streamer and the quote API share one process; call ``shutdown()``
+    on the returned server to stop it.
+    """
+
+    server = make_server(host, port, create_app(last_values=last_values), threaded=True)
+    threading.Thread(target=server.serve_forever, name="quote-server", daemon=True).start()
+    return server
+
+
 app = create_app()
@@ -0,0 +1,127 @@
+"""Tests for the rolling analytics stage."""
+from __future__ import annotations
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from streaming.analytics import AnalyticsStage, RollingReturns, RollingVWAP, VolumeProfile
+from streaming.config import Tick
+
+ALL_METRICS = ("vwap", "returns", "volatility", "volume_profile")
+
+
+def _series(count: int = 400, seed: int = 7):
+    """Prices and cumulative day volumes with quote-only updates and a session reset."""
+
+    rng = random.Random(seed)
+    prices, volumes = [], []
+    price, volume = 100.0, 1_000.0
+    for index in range(count):
+        if index == count // 2:
+            volume = 50.0  # cumulative volume restarts with a new session
+        elif rng.random() < 0.6:
+            price = round(price + rng.choice((-0.05, 0.05, 0.1)), 2)
+            volume += rng.randint(1, 20)
+        # otherwise a quote/depth update: same price, same cumulative volume
+        prices.append(price)
+        volumes.append(volume)
+    return prices, volumes
+
+
+def _live(stage: AnalyticsStage, instrument: str, prices, volumes):
+    seen = []
+    stage.subscribe(ALL_METRICS, lambda name, metrics: seen.append(metrics))
+    for price, volume in zip(prices, volumes):
+        stage.process(Tick(instrument=instrument, price=price, volume=volume))
+    return seen
+
+
+def _close(left, right) -> bool:
+    if left is None or (isinstance(right, float) and math.isnan(right)):
+        return left is None and math.isnan(right)
+    return left == pytest.approx(right, rel=1e-9, abs=1e-12)
+
+
+def test_live_and_batch_paths_agree():
+    prices, volumes = _series()
+    live = _live(AnalyticsStage(window=50), "A", prices, volumes)
+    batch = AnalyticsStage(window=50).process_batch("A", prices, volumes, notify=False)
+
+    for index, metrics in enumerate(live):
+        assert _close(metrics["vwap"], batch["vwap"][index])
+        assert _close(metrics["volatility"], batch["volatility"][index])
+    assert live[-1]["volume_profile"] == pytest.approx(batch["volume_profile"])
+    sampled = batch["returns"][np.isfinite(batch["returns"])]
+    assert live[-1]["returns"]["last"] == pytest.approx(sampled[-1])
+    assert live[-1]["returns"]["window"] == pytest.approx(sampled[-50:].sum())
+
+
+def test_batch_state_continues_live():
+    prices, volumes = _series()
+    split = 300
+    reference = AnalyticsStage(window=50)
+    _live(reference, "A", prices, volumes)
+
+    stage = AnalyticsStage(window=50)
+    stage.subscribe(ALL_METRICS, lambda name, metrics: None)
+    stage.process_batch("A", prices[:split], volumes[:split])
+    for price, volume in zip(prices[split:], volumes[split:]):
+        stage.process(Tick(instrument="A", price=price, volume=volume))
+
+    expected, actual = reference.snapshot("A"), stage.snapshot("A")
+    assert actual["vwap"] == pytest.approx(expected["vwap"])
+    assert actual["volatility"] == pytest.approx(expected["volatility"])
+    assert actual["returns"] == pytest.approx(expected["returns"])
+    assert dict(actual["volume_profile"]) == pytest.approx(dict(expected["volume_profile"]))
+
+
+def test_quote_updates_are_not_return_samples():
+    returns = RollingReturns(window=10, tick_size=0.05)
+    for price in (100.0, 100.0, 100.0, 101.0, 101.0):
+        returns.update(price, 0.0)
+    returns.update(101.0, 5.0)  # a trade at an unchanged price is a genuine zero return
+    assert returns._returns.count == 2
+
+
+def test_cumulative_volume_reset_starts_a_new_baseline():
+    stage = AnalyticsStage(window=10)
+    stage.subscribe(["vwap"], lambda name, metrics: None)
+    for price, volume in ((100.0, 500.0), (101.0, 510.0), (102.0, 20.0), (103.0, 25.0)):
+        stage.process(Tick(instrument="A", price=price, volume=volume))
+    # 10 @ 101 before the reset, 5 @ 103 after it; the reset tick itself trades nothing.
+    assert stage.snapshot("A")["vwap"] == pytest.approx((10 * 101.0 + 5 * 103.0) / 15)
+
+
+def test_volume_of_price_less_update_is_carried_forward():
+    stage = AnalyticsStage(window=10)
+    stage.subscribe(["vwap"], lambda name, metrics: None)
+    stage.process(Tick(instrument="A", price=100.0, volume=100.0))
+    stage.process(Tick(instrument="A", price=None, volume=110.0))
+    stage.process(Tick(instrument="A", price=102.0, volume=110.0))
+    assert stage.snapshot("A")["vwap"] == pytest.approx(102.0)
+
+
+def test_only_subscribed_metrics_are_computed():
+    stage = AnalyticsStage(window=10)
+    received = []
+    stage.subscribe(["vwap"], lambda name, metrics: received.append((name, metrics)), instruments=["A"])
+    for instrument in ("A", "B"):
+        stage.process(Tick(instrument=instrument, price=100.0, volume=10.0))
+        stage.process(Tick(instrument=instrument, price=101.0, volume=20.0))
+
+    assert set(stage._state) == {"A"}
+    assert set(stage._state["A"]) == {RollingVWAP}
+    assert [name for name, _ in received] == ["A", "A"]
+    assert all(set(metrics) == {"vwap"} for _, metrics in received)
+
+    stage.subscribe(["volume_profile"], lambda name, metrics: None)
+    stage.process(Tick(instrument="B", price=101.0, volume=30.0))
+    assert set(stage._state["B"]) == {VolumeProfile}
+
+
+def test_unknown_metric_is_rejected():
+    with pytest.raises(ValueError):
+        AnalyticsStage().subscribe(["vwap", "sharpe"], lambda name, metrics: None)
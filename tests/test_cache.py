@@ -0,0 +1,76 @@
+"""Tests for the last-value cache."""
+from __future__ import annotations
+
+import threading
+
+from streaming.cache import LastValueCache
+from streaming.config import Tick
+
+
+def _cache() -> LastValueCache:
+    return LastValueCache(["A", "B"], clock=lambda: 1000.0)
+
+
+def test_update_keeps_fields_missing_from_later_ticks():
+    cache = _cache()
+    assert cache.get("A") is None  # reserved but never ticked
+    cache.update(Tick(instrument="A", price=100.0, quantity=5, exchange_ts=999.0, volume=1_500.0))
+    cache.update(Tick(instrument="A", price=100.5))
+    quote = cache.get("A")
+    assert (quote.price, quote.quantity, quote.volume, quote.exchange_ts) == (100.5, 5, 1_500.0, 999.0)
+    assert quote.received_at == 1000.0 and quote.sequence == 2
+
+
+def test_snapshot_since_returns_only_newer_quotes():
+    cache = _cache()
+    cache.update(Tick(instrument="A", price=1.0))
+    cache.update(Tick(instrument="B", price=2.0))
+    seen = cache.sequence
+    assert set(cache.snapshot()) == {"A", "B"}
+    assert cache.snapshot(since=seen) == {}
+
+    cache.update(Tick(instrument="B", price=2.5))
+    cache.update(Tick(instrument="C", price=3.0))
+    changed = cache.snapshot(since=seen)
+    assert {name: quote.price for name, quote in changed.items()} == {"B": 2.5, "C": 3.0}
+    assert set(cache.snapshot(["A", "C", "missing"], since=seen)) == {"C"}
+
+
+def test_reader_waits_for_write_in_progress():
+    cache = _cache()
+    cache.update(Tick(instrument="A", price=1.0, volume=10.0))
+    slot = cache._slots["A"]
+    # Simulate a writer that has started updating the slot but not finished.
+    cache._versions[slot] += 1
+    cache._prices[slot] = 2.0
+
+    result = []
+    reader = threading.Thread(target=lambda: result.append(cache.get("A")))
+    reader.start()
+    reader.join(0.05)
+    assert reader.is_alive() and not result  # no torn read while the version is odd
+
+    cache._volumes[slot] = 20.0
+    cache._versions[slot] += 1
+    reader.join(1.0)
+    assert (result[0].price, result[0].volume) == (2.0, 20.0)
+
+
+def test_reader_retries_when_slot_changes_during_copy():
+    cache = _cache()
+    cache.update(Tick(instrument="A", price=1.0))
+    slot = cache._slots["A"]
+
+    class Versions(list):
+        reads = 0
+
+        def __getitem__(self, index):
+            Versions.reads += 1
+            if Versions.reads == 2:
+                # A complete write lands between the reader's two version checks.
+                cache.update(Tick(instrument="A", price=9.0))
+            return list.__getitem__(self, index)
+
+    cache._versions = Versions(cache._versions)
+    quote = cache.get("A")
+    assert quote.price == 9.0 and quote.sequence == cache._sequences[slot]
@@ -0,0 +1,16 @@
+"""Tests for CLI argument validation."""
+from __future__ import annotations
+
+import pytest
+
+from streaming import cli
+from streaming.factory import STREAMER_REGISTRY
+
+
+def test_provider_without_auth_service_is_rejected(monkeypatch, capsys):
+    # A plugin that only registered a streamer cannot get past authentication.
+    monkeypatch.setitem(STREAMER_REGISTRY._classes, "streamonly", object)
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main(["streamonly", "--api-key", "key", "--api-secret", "secret"])
+    assert excinfo.value.code == 2
+    assert "unsupported provider 'streamonly'" in capsys.readouterr().err
@@ -0,0 +1,128 @@
+"""Tests for the vectorised option chain analytics."""
+from __future__ import annotations
+
+import math
+from datetime import date
+
+import numpy as np
+import pytest
+
+from streaming.config import Tick
+from streaming.options import (
+    OptionChainStage,
+    OptionContract,
+    benchmark,
+    black_scholes_greeks,
+    black_scholes_price,
+    implied_volatility,
+)
+
+SPOT = 22000.0
+RATE = 0.065
+T = 30 / 365.0
+# Generous: a full 800-option recompute takes around 10 ms on a laptop.
+RECOMPUTE_BUDGET_S = 0.25
+
+
+def _grid():
+    strikes = np.repeat(np.linspace(0.8 * SPOT, 1.2 * SPOT, 41), 2)
+    is_call = np.tile([True, False], 41)
+    return strikes, is_call
+
+
+def test_put_call_parity():
+    strikes, _ = _grid()
+    sigma = np.full_like(strikes, 0.18)
+    calls = black_scholes_price(SPOT, strikes, T, RATE, sigma, np.ones_like(strikes, dtype=bool))
+    puts = black_scholes_price(SPOT, strikes, T, RATE, sigma, np.zeros_like(strikes, dtype=bool))
+    np.testing.assert_allclose(calls - puts, SPOT - strikes * math.exp(-RATE * T), atol=1e-6)
+
+    greeks_call = black_scholes_greeks(SPOT, strikes, T, RATE, sigma, np.ones_like(strikes, dtype=bool))
+    greeks_put = black_scholes_greeks(SPOT, strikes, T, RATE, sigma, np.zeros_like(strikes, dtype=bool))
+    np.testing.assert_allclose(greeks_call["delta"] - greeks_put["delta"], 1.0)
+    np.testing.assert_allclose(greeks_call["gamma"], greeks_put["gamma"])
+
+
+@pytest.mark.parametrize("sigma", [0.08, 0.2, 0.6])
+def test_implied_volatility_round_trips_in_and_out_of_the_money(sigma):
+    strikes, is_call = _grid()
+    true_sigma = np.full_like(strikes, sigma)
+    prices = black_scholes_price(SPOT, strikes, T, RATE, true_sigma, is_call)
+    # Far strikes at low volatility carry no time value, so they are outside the solvable range.
+    intrinsic = np.where(is_call, SPOT - strikes * math.exp(-RATE * T), strikes * math.exp(-RATE * T) - SPOT)
+    solvable = prices - np.maximum(intrinsic, 0.0) > 1e-6 * SPOT
+    itm = solvable & np.where(is_call, strikes < SPOT, strikes > SPOT)
+    otm = solvable & ~itm
+    assert itm.any() and otm.any()
+
+    solved = implied_volatility(prices, SPOT, strikes, T, RATE, is_call)
+    np.testing.assert_allclose(solved[solvable], sigma, rtol=1e-5)
+
+    warm = implied_volatility(prices, SPOT, strikes, T, RATE, is_call, initial=np.full_like(strikes, 0.3))
+    np.testing.assert_allclose(warm[solvable], sigma, rtol=1e-5)
+
+
+def test_implied_volatility_is_nan_outside_no_arbitrage_bounds():
+    strikes = np.array([20000.0, 20000.0, 24000.0, 24000.0, 22000.0])
+    is_call = np.array([True, True, False, False, True])
+    discounted = strikes * math.exp(-RATE * T)
+    prices = np.array([
+        SPOT - discounted[0] - 1.0,  # call below intrinsic
+        SPOT + 1.0,  # call above the spot
+        discounted[2] - SPOT - 1.0,  # put below intrinsic
+        discounted[3] + 1.0,  # put above the discounted strike
+        np.nan,
+    ])
+    assert np.isnan(implied_volatility(prices, SPOT, strikes, T, RATE, is_call)).all()
+    assert np.isnan(implied_volatility(np.array([500.0]), SPOT, np.array([22000.0]), 0.0, RATE, np.array([True]))).all()
+
+
+def _stage():
+    expiry = date(2026, 11, 26)
+    stage = OptionChainStage(rate=RATE)
+    for strike in (21900.0, 22000.0, 22100.0):
+        for option_type in ("CE", "PE"):
+            stage.add_contract(OptionContract(f"{option_type}{strike:.0f}", "NIFTY", expiry, strike, option_type))
+    chain = stage.chain("NIFTY", expiry)
+    return stage, chain, chain.expires_at - T * 365 * 86400
+
+
+def test_process_marks_only_changed_strikes_dirty():
+    stage, chain, now = _stage()
+    stage.process(Tick(instrument="CE22000", price=300.0))
+    stage.process(Tick(instrument="PE22000", price=280.0))
+    assert np.flatnonzero(chain.dirty).tolist() == [2, 3]
+    assert stage.recompute(now=now) == {}  # no spot yet, so nothing can be solved
+
+    stage.process(Tick(instrument="NIFTY", price=SPOT))
+    np.testing.assert_array_equal(stage.recompute(now=now)[("NIFTY", chain.expiry)], [2, 3])
+    assert np.isfinite(chain.iv[[2, 3]]).all() and np.isnan(chain.iv[[0, 1, 4, 5]]).all()
+
+    # Repeated prices are not changes; a new price dirties only its own strike.
+    stage.process(Tick(instrument="CE22000", price=300.0))
+    stage.process(Tick(instrument="NIFTY", price=SPOT))
+    assert not chain.dirty.any()
+    stage.process(Tick(instrument="PE22000", price=281.0))
+    assert np.flatnonzero(chain.dirty).tolist() == [3]
+
+    # A spot move dirties every priced strike, and only those.
+    stage.recompute(now=now)
+    stage.process(Tick(instrument="NIFTY", price=SPOT + 5.0))
+    assert np.flatnonzero(chain.dirty).tolist() == [2, 3]
+
+
+def test_chain_growth_keeps_existing_strikes():
+    stage = OptionChainStage()
+    expiry = date(2026, 11, 26)
+    for strike in range(1000):
+        stage.add_contract(OptionContract(f"CE{strike}", "X", expiry, float(strike), "CE"))
+        stage.process(Tick(instrument=f"CE{strike}", price=float(strike) + 1.0))
+    chain = stage.chain("X", expiry)
+    np.testing.assert_array_equal(chain.strikes, np.arange(1000.0))
+    np.testing.assert_array_equal(chain.prices, np.arange(1000.0) + 1.0)
+    assert chain.is_call.all() and chain.dirty.all() and len(chain.iv) == 1000
+
+
+def test_full_chain_recompute_within_budget():
+    # Best of three so a busy machine does not fail the check.
+    assert min(benchmark(strikes=400, repeat=5) for _ in range(3)) < RECOMPUTE_BUDGET_S
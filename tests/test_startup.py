@@ -0,0 +1,60 @@
+"""Startup latency regression tests for the CLI."""
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Heavy dependencies only needed once a provider actually runs.
+FORBIDDEN_MODULES = ("httpx", "websockets", "pyotp", "bs4", "importlib.metadata", "asyncio")
+
+# Ceiling for importing the CLI and building its parser (typically 50-80ms). Wall-clock
+# timings vary too much across machines for a tight bound, so this only catches gross
+# regressions; set STREAMING_IMPORT_BUDGET_MS to enforce a stricter budget, e.g. on a
+# dedicated benchmark runner. The module exclusion test is the hard gate.
+IMPORT_BUDGET_US = int(float(os.environ.get("STREAMING_IMPORT_BUDGET_MS", "1000")) * 1000)
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)$")
+
+
+def _top_level(code: str) -> tuple[dict[str, int], int]:
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    modules: dict[str, int] = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        modules[match.group(4)] = int(match.group(2))
+        # Unindented entries are imported directly by the snippet; their cumulative
+        # times add up to everything the snippet imported.
+        if len(match.group(3)) == 1:
+            total += int(match.group(2))
+    return modules, total
+
+
+CLI_STARTUP = "import streaming.cli; streaming.cli._build_parser()"
+
+
+def test_cli_startup_skips_provider_dependencies():
+    modules, _ = _top_level(CLI_STARTUP)
+    assert "streaming.cli" in modules
+    loaded = [name for name in FORBIDDEN_MODULES if name in modules]
+    assert not loaded, f"CLI startup imported {loaded}"
+
+
+def test_cli_startup_within_budget():
+    # Best of three runs to keep the check stable on a busy machine.
+    best = min(_top_level(CLI_STARTUP)[1] for _ in range(3))
+    assert best < IMPORT_BUDGET_US, f"CLI startup imports took {best / 1000:.1f}ms"
@@ -0,0 +1,198 @@
+"""Tests for the feed health watchdog and the streamer's reconnect policy."""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from datetime import datetime, time as dt_time
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from streaming.config import CredentialSet, StreamConfig, Tick, WatchdogConfig
+from streaming.providers.base import FeedStalledError, StreamingError, WebsocketDataStreamer
+from streaming.watchdog import FeedWatchdog
+
+ALWAYS_OPEN = {"market_open": None, "market_close": None}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _watchdog(instruments=(), **overrides):
+    clock = FakeClock()
+    config = WatchdogConfig(**{**ALWAYS_OPEN, **overrides})
+    watchdog = FeedWatchdog(config, instruments=instruments, clock=clock, wall_clock=lambda: 1000.0)
+    return watchdog, clock
+
+
+def test_silence_check_flags_quiet_connection():
+    watchdog, clock = _watchdog(max_silence=5.0)
+    assert watchdog.check() is None
+    clock.now = 4.0
+    watchdog.record_message()
+    clock.now = 8.0
+    assert watchdog.check() is None
+    clock.now = 9.5
+    assert "No messages received" in watchdog.check()
+
+
+def test_instrument_silence_covers_instruments_that_never_ticked():
+    watchdog, clock = _watchdog(instruments=["A", "B"], max_silence=None, max_instrument_silence=3.0)
+    watchdog.check()
+    clock.now = 3.5
+    watchdog.record_tick("A", None, watchdog.record_message())
+    assert watchdog.check() == "No ticks for instrument B for 3.5s"
+
+
+def test_market_hours_gate():
+    config = WatchdogConfig(market_open=dt_time(9, 15), market_close=dt_time(15, 30))
+    watchdog = FeedWatchdog(config)
+    tz = ZoneInfo("Asia/Kolkata")
+    assert watchdog.in_market_hours(datetime(2026, 10, 19, 10, 0, tzinfo=tz))  # Monday
+    assert not watchdog.in_market_hours(datetime(2026, 10, 19, 16, 0, tzinfo=tz))
+    assert not watchdog.in_market_hours(datetime(2026, 10, 18, 10, 0, tzinfo=tz))  # Sunday
+
+    clock = FakeClock()
+    closed = FeedWatchdog(WatchdogConfig(max_silence=1.0, market_days=()), clock=clock)
+    clock.now = 100.0
+    assert closed.check() is None
+
+
+def test_latency_sampled_only_when_exchange_timestamp_moves_forward():
+    watchdog, clock = _watchdog(max_silence=None)
+    clock.now = 1.0
+    received = watchdog.record_message()
+    # The first timestamp after connect may be a stale snapshot; repeats describe old trades.
+    watchdog.record_tick("A", 900.0, received)
+    watchdog.record_tick("A", 900.0, received)
+    assert watchdog.snapshot().latency_samples == 0
+    watchdog.record_tick("A", 1000.5, received)
+    watchdog.record_tick("A", 1000.5, received)
+    assert watchdog.snapshot().latency_samples == 1
+    assert watchdog.snapshot().instrument_latency["A"] == pytest.approx(0.5)
+
+
+def test_latency_check_uses_percentile_once_enough_samples():
+    watchdog, clock = _watchdog(max_silence=None, max_latency=0.5, min_latency_samples=2)
+    received = watchdog.record_message()
+    for exchange_ts in (990.0, 999.0, 999.5):
+        watchdog.record_tick("A", exchange_ts, received)
+    assert "latency" in watchdog.check()
+
+
+def test_watchdog_config_is_shared_safely():
+    with pytest.raises(AttributeError):
+        WebsocketDataStreamer.watchdog_config.max_silence = 1.0  # type: ignore[misc]
+
+
+class FakeSocket:
+    """Yields ``count`` messages ``spacing`` seconds apart, then stays open but silent."""
+
+    closed = False
+
+    def __init__(self, count: int, spacing: float = 0.0, forever: bool = False) -> None:
+        self.count = count
+        self.spacing = spacing
+        self.forever = forever
+
+    def __aiter__(self):
+        return self._messages()
+
+    async def _messages(self):
+        sent = 0
+        while self.forever or sent < self.count:
+            if self.spacing:
+                await asyncio.sleep(self.spacing)
+            sent += 1
+            yield json.dumps({"n": sent})
+        await asyncio.Event().wait()
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeStreamer(WebsocketDataStreamer):
+    websocket_url = "wss://example.invalid"
+
+    def __init__(self, make_socket, exchange_lag: float | None = None) -> None:
+        super().__init__(CredentialSet(api_key="key", api_secret="secret"))
+        self.make_socket = make_socket
+        self.exchange_lag = exchange_lag
+        self.connections = 0
+
+    async def _connect(self) -> None:
+        self.connections += 1
+        self._ws = self.make_socket()
+
+    async def _subscribe(self, config: StreamConfig) -> None:
+        return None
+
+    def decode_ticks(self, payload):
+        if self.exchange_lag is None:
+            return []
+        return [Tick(instrument="A", price=1.0, exchange_ts=time.time() - self.exchange_lag)]
+
+
+def _stream_config(errors, watchdog: WatchdogConfig, **overrides) -> StreamConfig:
+    return StreamConfig(
+        instruments=[],
+        on_message=lambda payload: None,
+        on_error=errors.append,
+        watchdog=watchdog,
+        **{"max_retries": 1, "retry_backoff": 0.001, **overrides},
+    )
+
+
+def _run(streamer: FakeStreamer, config: StreamConfig) -> None:
+    asyncio.run(asyncio.wait_for(streamer.stream(config), timeout=5))
+
+
+def test_frozen_feed_exhausts_retry_budget():
+    # Brokers replay a snapshot on subscribe, so every reconnect delivers a few messages.
+    streamer = FakeStreamer(lambda: FakeSocket(count=5))
+    errors: list = []
+    watchdog = WatchdogConfig(max_silence=0.05, check_interval=0.01, **ALWAYS_OPEN)
+    with pytest.raises(StreamingError):
+        _run(streamer, _stream_config(errors, watchdog))
+    assert streamer.connections == 2
+    assert all(isinstance(exc, FeedStalledError) for exc in errors)
+
+
+def test_persistent_latency_breach_exhausts_retry_budget():
+    streamer = FakeStreamer(lambda: FakeSocket(count=0, spacing=0.005, forever=True), exchange_lag=10.0)
+    errors: list = []
+    watchdog = WatchdogConfig(
+        max_silence=None, max_latency=1.0, min_latency_samples=3, check_interval=0.01, **ALWAYS_OPEN
+    )
+    with pytest.raises(StreamingError):
+        _run(streamer, _stream_config(errors, watchdog, retry_reset_after=0.05))
+    assert streamer.connections == 2
+
+
+class _Stop(Exception):
+    pass
+
+
+def test_stalls_after_healthy_runs_do_not_use_up_retries():
+    streamer = FakeStreamer(lambda: FakeSocket(count=20, spacing=0.01))
+    errors: list = []
+
+    def on_error(exc: Exception) -> None:
+        errors.append(exc)
+        if len(errors) == 3:
+            raise _Stop
+
+    watchdog = WatchdogConfig(max_silence=0.05, check_interval=0.01, **ALWAYS_OPEN)
+    config = _stream_config(errors, watchdog, retry_reset_after=0.1)
+    config.on_error = on_error
+    # With max_retries=1 a third stall would raise StreamingError unless the budget was reset.
+    with pytest.raises(_Stop):
+        _run(streamer, config)
+    assert streamer.connections == 3
+    assert all(isinstance(exc, FeedStalledError) for exc in errors)
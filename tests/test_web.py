@@ -0,0 +1,56 @@
+"""Tests for the quote routes of the web app."""
+from __future__ import annotations
+
+import pytest
+
+from streaming.cache import LastValueCache
+from streaming.config import Tick
+from streaming.web.app import create_app
+
+
+@pytest.fixture
+def cache() -> LastValueCache:
+    cache = LastValueCache(["NIFTY", "NSE_EQ|INE002A01018"], clock=lambda: 1000.0)
+    cache.update(Tick(instrument="NIFTY", price=22000.0, quantity=75, volume=1_000.0))
+    return cache
+
+
+@pytest.fixture
+def client(cache):
+    return create_app(last_values=cache).test_client()
+
+
+def test_list_quotes(client, cache):
+    response = client.get("/api/quotes")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["sequence"] == 1
+    assert body["quotes"]["NIFTY"]["price"] == 22000.0
+    assert body["quotes"]["NIFTY"]["volume"] == 1_000.0
+
+    cache.update(Tick(instrument="NSE_EQ|INE002A01018", price=2900.0))
+    body = client.get("/api/quotes?since=1&instruments=NIFTY,NSE_EQ|INE002A01018").get_json()
+    assert body["sequence"] == 2
+    assert list(body["quotes"]) == ["NSE_EQ|INE002A01018"]
+
+
+def test_list_quotes_rejects_bad_since(client):
+    response = client.get("/api/quotes?since=latest")
+    assert response.status_code == 400
+    assert "since" in response.get_json()["error"]
+
+
+def test_get_quote(client):
+    response = client.get("/api/quotes/NIFTY")
+    assert response.status_code == 200
+    assert response.get_json()["quantity"] == 75
+    # Reserved but never ticked, and entirely unknown instruments, are both missing.
+    assert client.get("/api/quotes/NSE_EQ|INE002A01018").status_code == 404
+    assert client.get("/api/quotes/UNKNOWN").status_code == 404
+
+
+@pytest.mark.parametrize("path", ["/api/quotes", "/api/quotes/NIFTY"])
+def test_quotes_unavailable_without_stream(path):
+    response = create_app().test_client().get(path)
+    assert response.status_code == 503
+    assert "error" in response.get_json()